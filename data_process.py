@@ -1,65 +1,66 @@
+import json
+import re
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
 BASE_DIR = Path(__file__).resolve().parent
 
 
 
 srcdataPath = BASE_DIR / "data"/"student_data.txt"
 src2dataPath = BASE_DIR/"data"/"bme_data.txt"
-targetdataPath = BASE_DIR/"data"/"processed_data.txt"
-
-DATA={} #TO store data after extracting from .txt files
-
-with open(srcdataPath,"r") as f:
-    student_data = f.readlines()
-    #print(student_data)
-    for student in student_data:
-        idx,name = student.strip().split("\t")
-        DATA[idx] = f"{name}"
-        
-
-    #print(student_data)
-    #print(DATA)
-
-
-BME_DATA={} #TO store data after extracting from .txt files
-
-with open(src2dataPath,"r") as f:
-    bme_data = f.readlines()
-   #print(bme_data)
-    for record in bme_data:
-        #print(record.strip().split(" "))
-        idx, sname, iname = record.strip().split(" ")
-        BME_DATA[idx] = f"{sname} {iname}"
-
-
-#print(BME_DATA.keys())
-# print("-----")
-# print(DATA.keys())
-#print(DATA)
-
-
-PROCESSED_DATA={} #TO store final processed data
-
-for raw_idx in DATA.keys():
-    #print(raw_idx)
-    idx = raw_idx[:-1]
+targetdataPath = BASE_DIR/"data"/"student_details.json"
+
+# "<raw_idx>\t<name>" lines and "<raw_idx> <surname> <initials>" lines
+STUDENT_LINE_RE = re.compile(r'^(\S+)\t(.+?)\s*$', re.M)
+BME_LINE_RE = re.compile(r'^(\S+) (\S+) (\S+)\s*$', re.M)
+
+
+def build_student_details(force=False):
+    """
+    Rebuild student_details.json from the .txt lists (skipped if already up
+    to date, or if the .txt lists are not there)
+    """
+    if not force and not (srcdataPath.exists() and src2dataPath.exists()):
+        return
+    
+    if not force and targetdataPath.exists():
+        newest_src = max(srcdataPath.stat().st_mtime, src2dataPath.stat().st_mtime)
+        if targetdataPath.stat().st_mtime >= newest_src:
+            return
+
+    print(f"# Building student details '{targetdataPath}'...")
+
+    #TO store data after extracting from .txt files
+    DATA = dict(STUDENT_LINE_RE.findall(srcdataPath.read_text()))
+
+    BME_DATA = {
+        idx: f"{sname} {iname}"
+        for idx, sname, iname in BME_LINE_RE.findall(src2dataPath.read_text())
+    }
 
+    #TO store final processed data
+    PROCESSED_DATA = {
+        raw_idx: {
+            "raw_idx": raw_idx,
+            "idx": raw_idx[:-1],
+            "name": DATA[raw_idx],
+            "spec": "BME" if raw_idx in BME_DATA else "ENTC"
+        }
+        for raw_idx in DATA
+    }
 
-    if raw_idx in BME_DATA.keys():
-        spec = "BME"
-        print("BME found:", idx )
-    else:
-        spec = "ENTC"
+    #print(json.dumps(PROCESSED_DATA, indent=4))
+    with open(targetdataPath,"wb") as f:
+        if orjson is not None:
+            f.write(orjson.dumps(PROCESSED_DATA, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            f.write(json.dumps(PROCESSED_DATA, indent=2).encode())
 
-    PROCESSED_DATA[raw_idx] ={
-        "raw_idx": raw_idx,
-        "idx":idx,
-        "name":DATA[raw_idx],
-        "spec":spec
-    }
 
-import json
-#print(json.dumps(PROCESSED_DATA, indent=4))
-with open(BASE_DIR/"data"/"student_details.json","w") as f:
-    json.dump(PROCESSED_DATA,f, indent=4)
\ No newline at end of file
+if __name__ == "__main__":
+    build_student_details(force=True)
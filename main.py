@@ -4,14 +4,34 @@ Scalable University GPA Analysis System
 Modular system for processing semester results from PDFs
 """
 
+import argparse
 import glob
+import hashlib
 import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import zip_longest
 from pathlib import Path
-import tabula
 import os.path
 import re
+import sys
 import xlsxwriter
 import math
+import numpy as np
+from dataclasses import dataclass
+
+from data_process import build_student_details
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib parser
+    orjson = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # Optional, the GPA sums fall back to NumPy
+    njit = None
 
 # ============================================================================
 # CONFIGURATION
@@ -25,20 +45,89 @@ CORRECTIONS_FILE = BASE_DIR/"config"/"corrections.json"
 SEMESTER_CONFIG_DIR = BASE_DIR/"config"/"semesters"
 RESULTS_FOLDER = BASE_DIR/"data"/"results"  # Folder containing PDF files
 OUTPUT_FOLDER = BASE_DIR/"output/"
+PDF_CACHE_DIR = BASE_DIR/".cache"/"pdf_results"  # Parsed PDF results keyed by file hash
+PDF_PARSER_VERSION = 1  # Bump when PDF parsing changes, so cached results are re-parsed
+USE_PDF_CACHE = True  # Turned off by `python -m main --no-cache` to re-parse every PDF
 
 GRADES = {}
+GPA_TABLES = {}  # {"4_0": {grade: gpa}, "4_2": {grade: gpa}}, derived from GRADES
+GRADE_ID = {}  # {grade: small int id}, in GRADES order
+GPA_4_0 = np.empty(0)  # GPA per grade id
+GPA_4_2 = np.empty(0)
+VALID_GRADES = frozenset()  # Cells that count as grades when detecting PDF columns
+
+# Student index pattern used when scanning PDF table cells (group 1 = the digits)
+_INDEX_RE = re.compile(r'(\d{6})[A-Z]?')
 
 
+@dataclass(slots=True, frozen=True)
+class Module:
+    """A course entry from a semester config"""
+    code: str
+    name: str
+    credits: float
+
 
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
+def _jload(filepath):
+    """Parse a JSON file (orjson when available, stdlib json otherwise)"""
+    if orjson is not None:
+        return orjson.loads(Path(filepath).read_bytes())
+    with open(filepath, 'r') as f:
+        return json.load(f)
+
+_JSON_CACHE = {}  # {resolved path: (mtime_ns, parsed JSON)} for config files
+
+def _jload_cached(filepath):
+    """
+    _jload for config files, re-parsed only when the file's mtime changes.
+    The parsed object is shared between calls, so callers must not mutate it.
+    """
+    path = Path(filepath).resolve()
+    mtime_ns = path.stat().st_mtime_ns
+    cached = _JSON_CACHE.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        cached = _JSON_CACHE[path] = (mtime_ns, _jload(path))
+    return cached[1]
+
+def _jdump(filepath, obj):
+    """
+    Write obj to a JSON file (orjson when available, stdlib json otherwise).
+    Written to a temporary file first, so readers never see a partial file.
+    """
+    if orjson is not None:
+        data = orjson.dumps(obj)
+    else:
+        data = json.dumps(obj).encode()
+    filepath = Path(filepath)
+    tmp_path = filepath.with_name(f"{filepath.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, filepath)
+
 def load_grades(filepath):
     """Load grades from JSON file"""
     print(f"# Loading grades from '{filepath}'...")
-    with open(filepath, 'r') as f:
-        return json.load(f)
+    return _jload_cached(filepath)
+
+def build_gpa_tables(grades):
+    """Flatten the grades config into one {grade: gpa} lookup table per scale"""
+    return {
+        scale: {grade: values[f"gpa_{scale}"] for grade, values in grades.items()}
+        for scale in ("4_0", "4_2")
+    }
+
+def set_grades(grades):
+    """Install a loaded grades config and the lookup tables derived from it"""
+    global GRADES, GPA_TABLES, GRADE_ID, GPA_4_0, GPA_4_2, VALID_GRADES
+    GRADES = grades
+    VALID_GRADES = frozenset(grades) | {"F", "I-we", "I-ca", "ab"}
+    GPA_TABLES = build_gpa_tables(grades)
+    GRADE_ID = {grade: grade_id for grade_id, grade in enumerate(grades)}
+    GPA_4_0 = np.fromiter(GPA_TABLES["4_0"].values(), dtype=np.float64, count=len(grades))
+    GPA_4_2 = np.fromiter(GPA_TABLES["4_2"].values(), dtype=np.float64, count=len(grades))
 
 def load_corrections(filepath):
     """Load grade corrections from JSON file"""
@@ -47,27 +136,27 @@ def load_corrections(filepath):
         return {}
         
     print(f"# Loading corrections from '{filepath}'...")
-    with open(filepath, 'r') as f:
-        return json.load(f)
+    # Re-key each module's corrections by integer index (non-numeric keys are skipped)
+    return {
+        module_code: {
+            int(idx_str): grade
+            for idx_str, grade in module_corrections.items()
+            if idx_str.strip().isdigit()
+        }
+        for module_code, module_corrections in _jload_cached(filepath).items()
+    }
 
 def load_students(filepath):
     """Load student details from JSON file and index by int(idx)"""
     print(f"# Loading student data from '{filepath}'...")
-    with open(filepath, 'r') as f:
-        raw_data = json.load(f)
+    raw_data = _jload_cached(filepath)
         
-    # Re-index by integer ID for matching with PDF results
-    processed_db = {}
-    for key, student in raw_data.items():
-        try:
-            # Assuming 'idx' field exists and is the numeric part
-            idx_int = int(student.get("idx", 0))
-            if idx_int > 0:
-                processed_db[idx_int] = student
-        except ValueError:
-            continue
-            
-    return processed_db
+    # Re-index by integer ID (the numeric 'idx' field) for matching with PDF results
+    return {
+        int(student["idx"]): student
+        for student in raw_data.values()
+        if str(student.get("idx", "")).isdigit() and int(student["idx"]) > 0
+    }
 
 def get_semester_config_files():
     """Get list of semester config files"""
@@ -103,8 +192,7 @@ def select_semester_config():
 def load_semester_config(filepath):
     """Load semester configuration and normalize structure"""
     print(f"# Loading semester config from '{filepath}'...")
-    with open(filepath, 'r') as f:
-        config = json.load(f)
+    config = dict(_jload_cached(filepath))  # Shallow copy, the cached dict stays untouched
         
     # Normalize 'sem_name' to 'semester_name'
     if "sem_name" in config:
@@ -113,139 +201,226 @@ def load_semester_config(filepath):
     # Normalize 'courses' list to 'modules' dict if necessary
     if "courses" in config and "modules" not in config:
         config["modules"] = {
-            m["code"]: m for m in config["courses"]
+            sys.intern(m["code"]): Module(sys.intern(m["code"]), m.get("name", ""), m["credits"])
+            for m in config["courses"]
         }
-        
+    elif "modules" in config:
+        # Configs already keyed by module code hold plain dicts
+        config["modules"] = {
+            sys.intern(code): Module(sys.intern(code), m.get("name", ""), m["credits"])
+            for code, m in config["modules"].items()
+        }
+
     return config
 
 # ============================================================================
 # PDF EXTRACTION FUNCTIONS
 # ============================================================================
 
+def _pdf_cache_file(pdf_path):
+    """
+    Cache file for a PDF's parsed results.
+    Keyed by the PDF contents, the grade set (which drives column detection)
+    and PDF_PARSER_VERSION.
+    """
+    with open(pdf_path, 'rb') as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            digest = hashlib.file_digest(f, "sha1")
+        else:
+            digest = hashlib.sha1(f.read())
+    digest.update("|".join(sorted(GRADES)).encode())
+    digest.update(f"parser-v{PDF_PARSER_VERSION}".encode())
+    
+    return PDF_CACHE_DIR / f"{Path(pdf_path).stem}-{digest.hexdigest()}.json"
+
 def extract_results_from_pdf(pdf_path, valid_indices):
     """
-    Extract index and grade pairs from a PDF file using robust column detection.
+    Extract index and grade pairs for valid students from a PDF file.
+    Parsed results are cached on disk, so unchanged PDFs are only parsed once
+    (unless run with --no-cache).
+    Returns: list of tuples [(index, grade), ...]
+    """
+    valid_indices = frozenset(valid_indices)
+    
+    if not USE_PDF_CACHE:
+        # Nothing is cached, so other students' rows are dropped while parsing
+        return _filter_valid(parse_results_from_pdf(pdf_path, valid_indices), valid_indices)
+    
+    cache_file = _pdf_cache_file(pdf_path)
+    
+    if cache_file.exists():
+        print(f"  - Using cached results for '{pdf_path}'")
+        all_pairs = _jload(cache_file)
+    else:
+        all_pairs = parse_results_from_pdf(pdf_path)
+        os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+        _jdump(cache_file, all_pairs)
+    
+    return _filter_valid(all_pairs, valid_indices)
+
+def _filter_valid(all_pairs, valid_indices):
+    """
+    Keep the pairs for this run's students (the cache holds every index in the PDF).
+    Grades are interned so the many repeated "A", "B+", ... share one object.
+    """
+    return [(idx, sys.intern(grade)) for idx, grade in all_pairs if idx in valid_indices]
+
+def parse_results_from_pdf(pdf_path, target_indices=None):
+    """
+    Parse index and grade pairs from a PDF file using robust column detection.
     Supports multi-column layouts where multiple Index/Grade pairs exist in a single row.
+    target_indices: optional set of indices to keep; None keeps every index
     Returns: list of tuples [(index, grade), ...]
     """
     print(f"  - Processing '{pdf_path}'...")
+    return list(iter_results_from_pdf(pdf_path, target_indices))
+
+def iter_results_from_pdf(pdf_path, target_indices=None):
+    """
+    Yield index and grade pairs from a PDF file one page at a time.
+    Each page's parsed layout is released before the next page is read.
+    """
+    # pdfplumber reads the ruled result tables in-process (no JVM start-up).
+    # Imported here so runs served from the PDF cache never load it.
+    import pdfplumber
     
-    # Use stream=True which works better for the observed PDF formats
-    grade_tables = tabula.read_pdf(pdf_path, pages="all", stream=True, pandas_options={'header': None})
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            for tbl in page.extract_tables():
+                yield from _pairs_from_table(tbl, target_indices)
+            page.close()
+
+def _pairs_from_table(tbl, target_indices=None):
+    """
+    Index and grade pairs from one extracted table (list of rows of cells)
+    Rows whose index is not in target_indices (when given) are skipped
+    """
     index_grade_pairs = []
     
-    for tbl in grade_tables:
-        if tbl.empty:
-            continue
-            
-        # Clean the table: drop all-NaN rows/cols if any
-        df = tbl.dropna(how='all').dropna(axis=1, how='all')
-        
-        # Reset column names to integer index to avoid confusion
-        df.columns = range(df.shape[1])
-        
-        # Heuristics to find pairs of Index and Grade columns
-        # We need to find ALL pairs, not just one.
-        
-        # 1. Start scanning from where valid data seems to begin (skip headers)
-        start_row = 0
-        for row_idx in range(min(5, len(df))):
-            row_vals = [str(x).strip().lower() for x in df.iloc[row_idx]]
-            if any("index" in x for x in row_vals) or any("grade" in x for x in row_vals):
-                start_row = row_idx + 1
-                break
+    # Clean the table: normalise cells (the only str/strip pass) and
+    # drop all-empty rows/cols
+    rows = [[(cell or "").strip() for cell in row] for row in tbl]
+    rows = [row for row in rows if any(row)]
+    if not rows:
+        return []
         
-        valid_rows_for_analysis = df.iloc[start_row:].head(20)
-        
-        # Identify columns by type: 'index', 'grade', or 'unknown'
-        col_types = {}
+    keep_cols = [c for c in range(len(rows[0])) if any(row[c] for row in rows)]
+    if len(keep_cols) < len(rows[0]):
+        rows = [[row[c] for c in keep_cols] for row in rows]
+    
+    # Heuristics to find pairs of Index and Grade columns
+    # We need to find ALL pairs, not just one.
+    
+    # 1. Start scanning from where valid data seems to begin (skip headers)
+    #    (first of the top 5 rows mentioning "index" or "grade"; the cells are
+    #    joined with tabs, so a match can't span two cells)
+    header_rows = ("\t".join(row).lower() for row in rows[:5])
+    start_row = next(
+        (row_idx + 1 for row_idx, text in enumerate(header_rows)
+         if "index" in text or "grade" in text),
+        0
+    )
+    
+    # Transpose the data rows once: one tuple of cells per column
+    data_columns = list(zip(*rows[start_row:]))
+    
+    # Identify columns by type: 'index', 'grade', or 'unknown',
+    # counting matches over the first 20 data rows of each column
+    threshold = min(20, len(rows) - start_row) * 0.3
+    col_types = {}
+    
+    for col_idx, column in enumerate(data_columns):
+        # Classify each cell once: exact grade (cheap set lookup) first,
+        # then the index pattern anywhere in the cell
+        index_matches = grade_matches = 0
+        for cell in column[:20]:
+            if cell in VALID_GRADES:
+                grade_matches += 1
+            elif _INDEX_RE.search(cell):
+                index_matches += 1
         
-        for col_idx in df.columns:
-            col_data = valid_rows_for_analysis[col_idx].astype(str).tolist()
-            
-            grade_matches = 0
-            index_matches = 0
+        # Determine type based on dominance
+        if index_matches > 0 and index_matches >= threshold:
+            col_types[col_idx] = 'index'
+        elif grade_matches > 0 and grade_matches >= threshold:
+            col_types[col_idx] = 'grade'
+        else:
+            col_types[col_idx] = 'unknown'
+
+    # Pairing strategy:
+    # Sort columns left-to-right. For each 'index' column, pair it with the 
+    # nearest 'grade' column to its right that hasn't been used.
+    
+    used_cols = set()
+    sorted_cols = sorted(col_types.keys())
+    
+    for i, idx_col in enumerate(sorted_cols):
+        if col_types[idx_col] == 'index' and idx_col not in used_cols:
+            # Look for nearest grade col to the right
+            grade_col = -1
             
-            for cell in col_data:
-                cell = cell.strip()
-                if not cell or cell.lower() == "nan": continue
-                
-                # Check for Index pattern anywhere in string
-                if re.search(r'\d{6}[A-Z]?', cell):
-                    index_matches += 1
-                
-                # Check for Grade
-                if cell in GRADES or cell in ["F", "I-we", "I-ca", "ab"]:
-                     grade_matches += 1
+            for j in range(i + 1, len(sorted_cols)):
+                candidate_col = sorted_cols[j]
+                if col_types[candidate_col] == 'grade' and candidate_col not in used_cols:
+                    grade_col = candidate_col
+                    break
             
-            # Determine type based on dominance
-            if index_matches > 0 and index_matches >= len(col_data) * 0.3:
-                col_types[col_idx] = 'index'
-            elif grade_matches > 0 and grade_matches >= len(col_data) * 0.3:
-                col_types[col_idx] = 'grade'
-            else:
-                col_types[col_idx] = 'unknown'
-
-        # Pairing strategy:
-        # Sort columns left-to-right. For each 'index' column, pair it with the 
-        # nearest 'grade' column to its right that hasn't been used.
-        
-        used_cols = set()
-        sorted_cols = sorted(col_types.keys())
-        
-        for i, idx_col in enumerate(sorted_cols):
-            if col_types[idx_col] == 'index' and idx_col not in used_cols:
-                # Look for nearest grade col to the right
-                grade_col = -1
-                
-                for j in range(i + 1, len(sorted_cols)):
-                    candidate_col = sorted_cols[j]
-                    if col_types[candidate_col] == 'grade' and candidate_col not in used_cols:
-                        grade_col = candidate_col
-                        break
+            if grade_col != -1:
+                # Found a pair
+                used_cols.add(idx_col)
+                used_cols.add(grade_col)
                 
-                if grade_col != -1:
-                    # Found a pair
-                    used_cols.add(idx_col)
-                    used_cols.add(grade_col)
-                    
-                    # Extract from this pair
-                    subset = df.iloc[start_row:, [idx_col, grade_col]].values
-                    
-                    for row_dat in subset:
-                        idx_raw = str(row_dat[0]).strip()
-                        grade = str(row_dat[1]).strip()
-                        
-                        if not idx_raw: continue
-
-                        try:
-                            # Extract numeric part from anywhere in the string
-                            numeric_part_match = re.search(r'(\d{6})', idx_raw)
-                            if numeric_part_match:
-                                idx_int = int(numeric_part_match.group(1))
-                                
-                                if idx_int in valid_indices:
-                                    if grade and grade.lower() != "nan":
-                                        index_grade_pairs.append((idx_int, grade))
-                        except ValueError:
-                            continue
+                # Extract from this pair
+                for idx_raw, grade in zip(data_columns[idx_col], data_columns[grade_col]):
+                    # Rows without a grade, or too short to hold a 6 digit
+                    # index (page numbers, totals), can never produce a pair
+                    if len(idx_raw) < 6 or not grade: continue
+
+                    try:
+                        # Fast path: cell starts with the index (e.g. "230012U"),
+                        # otherwise extract the numeric part from anywhere in the string
+                        digits = idx_raw[:6]
+                        if not digits.isdigit():
+                            numeric_part_match = _INDEX_RE.search(idx_raw)
+                            digits = numeric_part_match.group(1) if numeric_part_match else None
+                        if digits:
+                            idx = int(digits)
+                            if target_indices is not None and idx not in target_indices:
+                                continue
+                            index_grade_pairs.append((idx, grade))
+                    except ValueError:
+                        continue
 
     return index_grade_pairs
 
-def load_all_module_results(semester_config, course_info, corrections=None):
+def _init_worker(grades, use_pdf_cache):
+    """Share the loaded grade table and cache setting with PDF extraction worker processes"""
+    global USE_PDF_CACHE
+    set_grades(grades)
+    USE_PDF_CACHE = use_pdf_cache
+
+def _new_pdf_executor(max_workers):
+    """Process pool for PDF extraction, with GRADES and USE_PDF_CACHE shared to the workers"""
+    return ProcessPoolExecutor(max_workers=max_workers,
+                               initializer=_init_worker,
+                               initargs=(GRADES, USE_PDF_CACHE))
+
+def load_all_module_results(semester_config, course_info, corrections=None, executor=None):
     """
     Load results for all modules in the semester
+    Pass `executor` to reuse a PDF extraction pool across calls
     Returns: (results_dict, available_modules, module_stats)
     """
     results = {}
     available_modules = []
     module_stats = {}
 
-    valid_indices = set(course_info["students"].keys())
+    valid_indices = frozenset(course_info["students"])
 
     print("\n# Extracting results from PDFs...")
 
     semester_name = semester_config.get("semester_name", "")
+    pdf_jobs = []
 
     for module_code, module_info in semester_config["modules"].items():
 
@@ -253,8 +428,8 @@ def load_all_module_results(semester_config, course_info, corrections=None):
         # Create module entry regardless of whether a PDF exists
         # ---------------------------------------------------------
         module_stats[module_code] = {
-            "credits": module_info["credits"],
-            "grade_counts": {}
+            "credits": module_info.credits,
+            "grade_counts": Counter()
         }
 
         pdf_path = RESULTS_FOLDER / semester_name / f"{module_code}.pdf"
@@ -272,20 +447,7 @@ def load_all_module_results(semester_config, course_info, corrections=None):
             available_modules.append(module_code)
 
         if pdf_exists:
-            try:
-                module_results = extract_results_from_pdf(pdf_path, valid_indices)
-            except Exception as exc:
-                print(f"    ! Failed to process '{pdf_path}': {exc}")
-                module_results = []
-
-            for idx, grade in module_results:
-                if idx not in results:
-                    results[idx] = {}
-
-                results[idx][module_code] = grade
-
-                module_stats[module_code]["grade_counts"][grade] = \
-                    module_stats[module_code]["grade_counts"].get(grade, 0) + 1
+            pdf_jobs.append((module_code, pdf_path))
 
         else:
             print(f"  ! Warning: '{pdf_path}' not found.")
@@ -293,6 +455,40 @@ def load_all_module_results(semester_config, course_info, corrections=None):
             if has_manual_data:
                 print(f"    -> Using manual corrections for {module_code}")
 
+    # ---------------------------------------------------------
+    # Extract module PDFs in parallel (one task per PDF)
+    # ---------------------------------------------------------
+    if pdf_jobs:
+        if executor is None:
+            pool = _new_pdf_executor(min(len(pdf_jobs), os.cpu_count() or 1))
+        else:
+            pool = nullcontext(executor)  # Owned (and shut down) by the caller
+
+        with pool as executor:
+            futures = [
+                (module_code, pdf_path,
+                 executor.submit(extract_results_from_pdf, pdf_path, valid_indices))
+                for module_code, pdf_path in pdf_jobs
+            ]
+
+            # Merge in semester config order so the output is deterministic
+            for module_code, pdf_path, future in futures:
+                try:
+                    module_results = future.result()
+                except Exception as exc:
+                    print(f"    ! Failed to process '{pdf_path}': {exc}")
+                    module_results = []
+
+                for idx, grade in module_results:
+                    if idx not in results:
+                        results[idx] = {}
+
+                    results[idx][module_code] = grade
+
+                module_stats[module_code]["grade_counts"].update(
+                    grade for _, grade in module_results
+                )
+
     # ---------------------------------------------------------
     # Apply manual corrections
     # ---------------------------------------------------------
@@ -306,12 +502,7 @@ def load_all_module_results(semester_config, course_info, corrections=None):
                 print(f"  ! Warning: {module_code} exists in corrections.json but not in semester config.")
                 continue
 
-            for idx_str, new_grade in module_corrections.items():
-
-                try:
-                    idx = int(idx_str)
-                except ValueError:
-                    continue
+            for idx, new_grade in module_corrections.items():
 
                 if idx not in valid_indices:
                     continue
@@ -320,22 +511,23 @@ def load_all_module_results(semester_config, course_info, corrections=None):
                     results[idx] = {}
 
                 old_grade = results[idx].get(module_code)
+                grade_counts = module_stats[module_code]["grade_counts"]
 
                 # Remove old grade from statistics
                 if old_grade is not None:
-                    if old_grade in module_stats[module_code]["grade_counts"]:
-                        module_stats[module_code]["grade_counts"][old_grade] -= 1
+                    if old_grade in grade_counts:
+                        grade_counts[old_grade] -= 1
 
-                        if module_stats[module_code]["grade_counts"][old_grade] <= 0:
-                            del module_stats[module_code]["grade_counts"][old_grade]
+                        if grade_counts[old_grade] <= 0:
+                            del grade_counts[old_grade]
 
                 # Apply new grade
+                new_grade = sys.intern(new_grade)
                 results[idx][module_code] = new_grade
 
-                module_stats[module_code]["grade_counts"][new_grade] = \
-                    module_stats[module_code]["grade_counts"].get(new_grade, 0) + 1
+                grade_counts[new_grade] += 1
 
-                print(f"  - {module_code}: {idx} -> {new_grade}")
+                print(f"  - Corrected {idx} in {module_code}: {old_grade} -> {new_grade}")
 
     return results, available_modules, module_stats
 
@@ -346,58 +538,128 @@ def truncate(num, decimals=0):
     factor = 10 ** decimals
     return int(num * factor) / factor
 
-def calculate_gpa(student_results, module_stats, scale="4_0"):
+def calculate_gpa(student_results, module_stats, gpa_table):
     """
     Calculate GPA for a student based on available modules
-    scale: "4_0" or "4_2"
+    gpa_table: GPA_TABLES["4_0"] or GPA_TABLES["4_2"]
     """
     total_credits = 0
     weighted_sum = 0
     
     for module_code, grade in student_results.items():
-        if module_code in module_stats and grade in GRADES:
-            credits = module_stats[module_code]["credits"]
-            gpa_value = GRADES[grade][f"gpa_{scale}"]
-            
-            weighted_sum += credits * gpa_value
-            total_credits += credits
+        module = module_stats.get(module_code)
+        if module is None:
+            continue
+        gpa_value = gpa_table.get(grade)
+        if gpa_value is None:
+            continue
+        
+        credits = module["credits"]
+        weighted_sum += credits * gpa_value
+        total_credits += credits
     
     if total_credits == 0:
         return 0.0
     
-
     return truncate(weighted_sum / total_credits, 3)
 
-def calculate_max_possible_gpa(student_results, module_stats, semester_config):
-    """
-    Calculate maximum possible GPA if student gets A in all remaining modules
-    """
-    # Current weighted sum (4.0 scale)
-    current_sum = 0
-    current_credits = 0
-    
-    for module_code, grade in student_results.items():
-        if module_code in module_stats and grade in GRADES:
-            credits = module_stats[module_code]["credits"]
-            gpa_value = GRADES[grade]["gpa_4_0"]
-            current_sum += credits * gpa_value
-            current_credits += credits
-    
-    # Total credits for all modules in semester
-    total_credits = sum(m["credits"] for m in semester_config["modules"].values())
-    
-    # Maximum possible sum (assuming A in remaining modules)
-    max_sum = current_sum + (total_credits - current_credits) * 4.0
-    
-    if total_credits == 0:
-        return 0.0
-    
-    return truncate(max_sum / total_credits, 3)
-
 # ============================================================================
 # RANKING AND SORTING
 # ============================================================================
 
+def _grade_rows(student_results, modules):
+    """Grade strings for an iterable of {module: grade} dicts, one list per student ("-" = no result)"""
+    return [
+        [module_grades.get(module, "-") for module in modules]
+        for module_grades in student_results
+    ]
+
+def _grade_matrix(grade_rows, n_modules):
+    """
+    Grade id matrix for _grade_rows output:
+    one row per student, one column per module (-1 = no valid grade)
+    """
+    rows = [[GRADE_ID.get(grade, -1) for grade in row] for row in grade_rows]
+    return np.array(rows, dtype=np.int8).reshape(len(rows), n_modules)
+
+def _sum_order(student_results, modules):
+    """
+    Column order per student for the GPA sums: the student's own modules in
+    the order calculate_gpa adds them ({module: grade} insertion order),
+    then the remaining columns. Float sums depend on the order of terms, so
+    this keeps the truncated GPAs identical to calculate_gpa.
+    """
+    col_of = {module: col for col, module in enumerate(modules)}
+    rows = []
+    for module_grades in student_results:
+        own = [col_of[module] for module in module_grades if module in col_of]
+        taken = set(own)
+        rows.append(own + [col for col in range(len(modules)) if col not in taken])
+    return np.array(rows, dtype=np.intp).reshape(len(rows), len(modules))
+
+def _ordered_for_sums(codes, credits_vec, order):
+    """Grade ids and credits per student, with the columns in _sum_order"""
+    return np.take_along_axis(codes, order, axis=1), credits_vec[order]
+
+def _credits_vector(module_stats, modules):
+    """Credits of each module, in column order"""
+    return np.array([module_stats[m]["credits"] for m in modules], dtype=np.float64)
+
+def _truncate_gpas(num, den):
+    """Element-wise truncate(num / den, 3), 0.0 where den is 0"""
+    gpa = np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+    return np.trunc(gpa * 1000) / 1000
+
+def _weighted_gpa_sums_numpy(codes, gpa_table, credits):
+    """
+    Per-student (sum of gpa * credits, sum of credits) over graded modules
+    codes, credits: student x column matrices from _ordered_for_sums
+    """
+    graded = codes >= 0
+    weighted = np.where(graded, gpa_table[codes] * credits, 0.0)
+    counted = np.where(graded, credits, 0.0)
+    # Add the columns in order (vectorised over students) so the sums
+    # match calculate_gpa bit for bit before truncation
+    num = np.zeros(codes.shape[0])
+    den = np.zeros(codes.shape[0])
+    for col in range(codes.shape[1]):
+        num += weighted[:, col]
+        den += counted[:, col]
+    return num, den
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _weighted_gpa_sums_numba(codes, gpa_table, credits):
+        """Compiled version of _weighted_gpa_sums_numpy (same summation order)"""
+        n = codes.shape[0]
+        num = np.zeros(n)
+        den = np.zeros(n)
+        for i in prange(n):
+            student_num = 0.0
+            student_den = 0.0
+            for j in range(codes.shape[1]):
+                c = codes[i, j]
+                if c >= 0:
+                    student_num += gpa_table[c] * credits[i, j]
+                    student_den += credits[i, j]
+            num[i] = student_num
+            den[i] = student_den
+        return num, den
+
+    _weighted_gpa_sums = _weighted_gpa_sums_numba
+else:
+    _weighted_gpa_sums = _weighted_gpa_sums_numpy
+
+def _competition_ranks(sorted_gpas):
+    """
+    Ranks for GPAs listed in ranking order: equal consecutive GPAs share the
+    rank of the first of the run, the next GPA resumes at its position ("1, 1, 3")
+    """
+    starts_run = np.ones(len(sorted_gpas), dtype=bool)
+    starts_run[1:] = sorted_gpas[1:] != sorted_gpas[:-1]
+    positions = np.arange(1, len(sorted_gpas) + 1)
+    return np.maximum.accumulate(np.where(starts_run, positions, 0)).tolist()
+
 def rank_students(results, module_stats, semester_config, available_modules):
     """
     Calculate GPAs and rank students
@@ -405,67 +667,63 @@ def rank_students(results, module_stats, semester_config, available_modules):
     """
     print("\n# Calculating GPAs and rankings...")
     
+    # Grade strings are kept per student for the export, ids for the maths
+    grade_rows = _grade_rows(results.values(), available_modules)
+    codes = _grade_matrix(grade_rows, len(available_modules))
+    graded = codes >= 0
+    
+    credits_vec = _credits_vector(module_stats, available_modules)
+    sum_codes, sum_credits = _ordered_for_sums(
+        codes, credits_vec, _sum_order(results.values(), available_modules)
+    )
+    
+    sum_4_0, total_credits = _weighted_gpa_sums(sum_codes, GPA_4_0, sum_credits)
+    sum_4_2, _ = _weighted_gpa_sums(sum_codes, GPA_4_2, sum_credits)
+    
+    # Maximum possible GPA assumes an A (4.0) in every remaining module
+    semester_credits = sum(m.credits for m in semester_config["modules"].values())
+    max_sum = sum_4_0 + (semester_credits - total_credits) * 4.0
+    
+    gpa_4_0_arr = _truncate_gpas(sum_4_0, total_credits)
+    gpa_4_2_arr = _truncate_gpas(sum_4_2, total_credits)
+    max_gpa_arr = _truncate_gpas(max_sum, np.full(len(results), float(semester_credits)))
+    
+    gpas_4_0 = gpa_4_0_arr.tolist()
+    gpas_4_2 = gpa_4_2_arr.tolist()
+    max_gpas = max_gpa_arr.tolist()
+    
     student_data = {}
     
-    for idx, module_grades in results.items():
-        gpa_4_0 = calculate_gpa(module_grades, module_stats, "4_0")
-        gpa_4_2 = calculate_gpa(module_grades, module_stats, "4_2")
-        max_gpa = calculate_max_possible_gpa(module_grades, module_stats, semester_config)
-        
+    for i, (idx, module_grades) in enumerate(results.items()):
         student_data[idx] = {
             "modules": module_grades,
-            "gpa_4_0": gpa_4_0,
-            "gpa_4_2": gpa_4_2,
-            "max_gpa": max_gpa,
+            "grades": grade_rows[i],  # In available_modules order
+            "gpa_4_0": gpas_4_0[i],
+            "gpa_4_2": gpas_4_2[i],
+            "max_gpa": max_gpas[i],
             "module_count": len(module_grades)
         }
     
-    # Sort by: GPA (4.0), then GPA (4.2), then individual module GPAs, then index
-    def sort_key(item):
-        idx, data = item
-        gpa_4_0 = data["gpa_4_0"]
-        gpa_4_2 = data["gpa_4_2"]
-        
-        # Get GPA values for each available module (for tie-breaking)
-        module_gpas = []
-        for module in available_modules:
-            if module in data["modules"] and data["modules"][module] in GRADES:
-                module_gpas.append(GRADES[data["modules"][module]]["gpa_4_2"])
-            else:
-                module_gpas.append(0.0)
-        
-        return (gpa_4_0, gpa_4_2, *module_gpas, -idx)
-    
-    sorted_students = sorted(student_data.items(), key=sort_key, reverse=True)
-    
-    # Assign ranks
-    prev_gpa_4_0 = None
-    prev_gpa_4_2 = None
-    rank = 1
-    rank_4_2 = 1
-    rank_gap = 0
-    rank_4_2_gap = 0
-    
-    for i, (idx, data) in enumerate(sorted_students):
-        # Rank by 4.0 GPA
-        if prev_gpa_4_0 == data["gpa_4_0"]:
-            data["rank"] = rank
-            rank_gap += 1
-        else:
-            rank += rank_gap
-            data["rank"] = rank
-            rank_gap = 1
-            prev_gpa_4_0 = data["gpa_4_0"]
-        
-        # Rank by 4.2 GPA (tie-breaker)
-        if prev_gpa_4_2 == data["gpa_4_2"]:
-            data["rank_4_2"] = rank_4_2
-            rank_4_2_gap += 1
-        else:
-            rank_4_2 += rank_4_2_gap
-            data["rank_4_2"] = rank_4_2
-            rank_4_2_gap = 1
-            prev_gpa_4_2 = data["gpa_4_2"]
+    # Sort by: GPA (4.0), then GPA (4.2), then individual module GPAs (4.2 scale,
+    # for tie-breaking), all descending, then index ascending.
+    # np.lexsort treats the last key as the primary one.
+    idx_arr = np.array(list(results.keys()), dtype=np.int64)
+    module_gpas = np.where(graded, GPA_4_2[codes], 0.0)
+    
+    sort_keys = [idx_arr]
+    sort_keys += [-module_gpas[:, col] for col in reversed(range(len(available_modules)))]
+    sort_keys += [-gpa_4_2_arr, -gpa_4_0_arr]
+    order = np.lexsort(sort_keys)
+    
+    sorted_students = [(idx, student_data[idx]) for idx in idx_arr[order].tolist()]
+    
+    # Assign ranks in sorted order
+    ranks = _competition_ranks(gpa_4_0_arr[order])
+    ranks_4_2 = _competition_ranks(gpa_4_2_arr[order])  # Tie-breaker rank on the 4.2 scale
+    
+    for (idx, data), rank, rank_4_2 in zip(sorted_students, ranks, ranks_4_2):
+        data["rank"] = rank
+        data["rank_4_2"] = rank_4_2
     
     return sorted_students
 
@@ -473,6 +731,8 @@ def rank_students(results, module_stats, semester_config, available_modules):
 # EXCEL EXPORT FUNCTIONS
 # ============================================================================
 
+ZERO_GRADE_STAT = "0(0.0%)"  # Grade statistics cell for a grade nobody got
+
 def export_to_excel(sorted_students, students_db, available_modules, module_stats, 
                     semester_config, course_name):
     """Export results to Excel files"""
@@ -485,177 +745,163 @@ def export_to_excel(sorted_students, students_db, available_modules, module_stat
     n_modules = len(available_modules)
     total_modules = len(semester_config["modules"])
     
-    # ========== File 1: Basic Results ==========
-    filename1 = OUTPUT_FOLDER / f"Results - {semester_name}.xlsx"
-    workbook1 = xlsxwriter.Workbook(filename1)
-    ws1 = workbook1.add_worksheet("Results")
-    
-    # Headers
-    ws1.write(0, 0, "Rank")
-    ws1.write(0, 1, "Index")
-    
-    for i, module in enumerate(available_modules):
-        ws1.write(0, i + 2, module)
-    
-    col = n_modules + 2
-    if n_modules != total_modules:
-        ws1.write(0, col, "Current SGPA")
-        ws1.write(0, col + 1, "Max Possible SGPA")
-    else:
-        ws1.write(0, col, "SGPA")
-    
-    # Student data
-    for row, (idx, data) in enumerate(sorted_students, start=1):
-        student_info = students_db.get(idx, {})
-        
-        ws1.write(row, 0, data["rank"])
-        ws1.write(row, 1, student_info.get("idx", idx))
-        
-        for col, module in enumerate(available_modules, start=2):
-            grade = data["modules"].get(module, "-")
-            ws1.write(row, col, grade)
-        
-        col = n_modules + 2
-        ws1.write(row, col, data["gpa_4_0"])
-        if n_modules != total_modules:
-            ws1.write(row, col + 1, data["max_gpa"])
-    
-    # Grade statistics
-    col_offset = n_modules + 6 if n_modules == total_modules else n_modules + 5
-    
-    for i, module in enumerate(available_modules):
-        ws1.write(0, col_offset + i, module)
+    # Grade statistics rows: [grade, "count(pct%)" per module]
+    # (totals of 0 become 1, the count is then 0 so the cell is still "0(0.0%)")
+    module_totals = {
+        module: sum(module_stats[module]["grade_counts"].values()) or 1
+        for module in available_modules
+    }
     
-    row = 1
+    grade_stats_rows = []
     for grade in GRADES.keys():
-        ws1.write(row, col_offset - 1, grade)
+        stats_row = [grade]
         
-        for i, module in enumerate(available_modules):
+        for module in available_modules:
             count = module_stats[module]["grade_counts"].get(grade, 0)
-            total = sum(module_stats[module]["grade_counts"].values())
-            percentage = (count / total * 100) if total > 0 else 0
-            ws1.write(row, col_offset + i, f"{count}({percentage:.1f}%)")
+            if count:
+                stats_row.append(f"{count}({count / module_totals[module] * 100:.1f}%)")
+            else:
+                stats_row.append(ZERO_GRADE_STAT)
         
-        row += 1
-    
-    workbook1.close()
-    print(f"  [OK] Created '{filename1}'")
+        grade_stats_rows.append(stats_row)
     
+    # Workbooks are streamed row by row (constant_memory), so the grade
+    # statistics are written alongside the student rows, in row order.
     
-
-    
-    # ========== File 2: Extended Results ==========
+    # File 1: Basic Results, File 2: Extended Results (adds name and 4.2 rank)
+    filename1 = OUTPUT_FOLDER / f"Results - {semester_name}.xlsx"
     filename2 = OUTPUT_FOLDER / f"Results - {semester_name} (Extended).xlsx"
-    workbook2 = xlsxwriter.Workbook(filename2)
+    workbook1 = xlsxwriter.Workbook(filename1, {'constant_memory': True})
+    workbook2 = xlsxwriter.Workbook(filename2, {'constant_memory': True})
+    ws1 = workbook1.add_worksheet("Results")
     ws2 = workbook2.add_worksheet("Results")
     
-    # Headers
-    ws2.write(0, 0, "Rank")
-    ws2.write(0, 1, "Index")
-    ws2.write(0, 2, "Name")
-    
-    for i, module in enumerate(available_modules):
-        ws2.write(0, i + 3, module)
-    
-    col = n_modules + 3
     if n_modules != total_modules:
-        ws2.write(0, col, "Current SGPA")
-        ws2.write(0, col + 1, "Max Possible SGPA")
-        ws2.write(0, col + 2, "Rank (4.2 scale)")
+        gpa_headers = ["Current SGPA", "Max Possible SGPA"]
+        col_offset1, col_offset2 = n_modules + 5, n_modules + 7
     else:
-        ws2.write(0, col, "SGPA")
-        ws2.write(0, col + 1, "Rank (4.2 scale)")
+        gpa_headers = ["SGPA"]
+        col_offset1, col_offset2 = n_modules + 6, n_modules + 8
     
-    # Student data
-    for row, (idx, data) in enumerate(sorted_students, start=1):
-        student_info = students_db.get(idx, {})
-        
-        ws2.write(row, 0, data["rank"])
-        ws2.write(row, 1, student_info.get("idx", idx))
-        ws2.write(row, 2, student_info.get("name", "Unknown"))
-        
-        for col, module in enumerate(available_modules, start=3):
-            grade = data["modules"].get(module, "-")
-            ws2.write(row, col, grade)
-        
-        col = n_modules + 3
-        ws2.write(row, col, data["gpa_4_0"])
-        if n_modules != total_modules:
-            ws2.write(row, col + 1, data["max_gpa"])
-            ws2.write(row, col + 2, data["rank_4_2"])
-        else:
-            ws2.write(row, col + 1, data["rank_4_2"])
-    
-    # Grade statistics
-    col_offset = n_modules + 8 if n_modules == total_modules else n_modules + 7
-    
-    for i, module in enumerate(available_modules):
-        ws2.write(0, col_offset + i, module)
+    # Headers
+    ws1.write_row(0, 0, ["Rank", "Index", *available_modules, *gpa_headers])
+    ws1.write_row(0, col_offset1, available_modules)
+    ws2.write_row(0, 0, ["Rank", "Index", "Name", *available_modules, *gpa_headers, "Rank (4.2 scale)"])
+    ws2.write_row(0, col_offset2, available_modules)
     
-    row = 1
-    for grade in GRADES.keys():
-        ws2.write(row, col_offset - 1, grade)
-        
-        for i, module in enumerate(available_modules):
-            count = module_stats[module]["grade_counts"].get(grade, 0)
-            total = sum(module_stats[module]["grade_counts"].values())
-            percentage = (count / total * 100) if total > 0 else 0
-            ws2.write(row, col_offset + i, f"{count}({percentage:.1f}%)")
+    # Student data and grade statistics
+    for row, (student, stats_row) in enumerate(
+            zip_longest(sorted_students, grade_stats_rows), start=1):
+        if student is not None:
+            idx, data = student
+            student_info = students_db.get(idx, {})
+            
+            grades = data["grades"]
+            gpas = [data["gpa_4_0"]]
+            if n_modules != total_modules:
+                gpas.append(data["max_gpa"])
+            
+            ws1.write_row(row, 0, [data["rank"], student_info.get("idx", idx), *grades, *gpas])
+            ws2.write_row(row, 0, [data["rank"], student_info.get("idx", idx),
+                                   student_info.get("name", "Unknown"), *grades, *gpas,
+                                   data["rank_4_2"]])
         
-        row += 1
+        if stats_row is not None:
+            ws1.write_row(row, col_offset1 - 1, stats_row)
+            ws2.write_row(row, col_offset2 - 1, stats_row)
+    
+    workbook1.close()
+    print(f"  [OK] Created '{filename1}'")
     
     workbook2.close()
     print(f"  [OK] Created '{filename2}'")
 
+def export_cgpa_excel(final_results, semester_names):
+    """Export ranked CGPA results (already sorted by CGPA) to Excel"""
+    print("\n# Exporting CGPA Results...")
+    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+    filename = OUTPUT_FOLDER / "CGPA_Results.xlsx"
+    workbook = xlsxwriter.Workbook(filename, {'constant_memory': True})
+    ws = workbook.add_worksheet("CGPA")
+    
+    # Headers
+    ws.write_row(0, 0, ["Rank", "Index", "Name", *semester_names, "CGPA"])
+    
+    # Data (streamed in row order)
+    for rank, student in enumerate(final_results, start=1):
+        semesters = student['semesters']
+        ws.write_row(rank, 0, [rank, student['idx'], student['name'],
+                               *[semesters.get(sem, 0.0) for sem in semester_names],
+                               student['cgpa']])
+    
+    workbook.close()
+    print(f"  [OK] Created '{filename}'")
+
 # ============================================================================
 # CGPA CALCULATION FUNCTIONS
 # ============================================================================
 
-def process_semester_for_cgpa(semester_config_path, student_indices, students_db, corrections):
+_SEMESTER_CACHE = {}  # {semester cache key: (semester_name, processed_data)}, per process
+
+def _semester_cache_key(semester_config_path, semester_name, student_indices, corrections):
+    """Everything a semester's CGPA data depends on: config, corrections, students and PDFs"""
+    pdf_files = (RESULTS_FOLDER / semester_name).glob("*.pdf")
+    return (
+        str(semester_config_path),
+        os.stat(semester_config_path).st_mtime_ns,
+        hash(json.dumps(corrections, sort_keys=True)),
+        tuple(student_indices),
+        tuple(sorted((p.name, p.stat().st_mtime_ns) for p in pdf_files)),
+    )
+
+def process_semester_for_cgpa(semester_config_path, student_indices, students_db, corrections,
+                              executor=None):
     """
     Process a single semester for CGPA calculation.
     Returns: (semester_name, semester_results_per_student)
-    semester_results_per_student = {student_idx: {'sgpa': float, 'credits': int, 'weighted_points': float}}
+    semester_results_per_student = {student_idx: {'sgpa': float, 'credits': float, 'weighted_points': float}}
     """
     semester_config = load_semester_config(semester_config_path)
     semester_name = semester_config.get("semester_name", "Unknown")
     
     print(f"\n# Processing {semester_name}...")
     
+    # Re-entering CGPA mode from the menu reuses unchanged semesters
+    cache_key = _semester_cache_key(semester_config_path, semester_name, student_indices, corrections)
+    if cache_key in _SEMESTER_CACHE:
+        print(f"  - Using results already computed for {semester_name}")
+        return _SEMESTER_CACHE[cache_key]
+    
     course_info = {"index_range": (0, 0), "students": students_db} # Range not strictly needed here
     
     # Load results
     results, available_modules, module_stats = load_all_module_results(
-        semester_config, course_info, corrections
+        semester_config, course_info, corrections, executor
     )
     
-    processed_data = {}
+    # SGPA variables for every student at once (4.0 scale)
+    student_results = [results.get(idx, {}) for idx in student_indices]
+    codes = _grade_matrix(_grade_rows(student_results, available_modules), len(available_modules))
+    sum_codes, sum_credits = _ordered_for_sums(
+        codes,
+        _credits_vector(module_stats, available_modules),
+        _sum_order(student_results, available_modules)
+    )
+    weighted_sums, total_credits = _weighted_gpa_sums(sum_codes, GPA_4_0, sum_credits)
+    sgpas = _truncate_gpas(weighted_sums, total_credits)
     
-    for idx in student_indices:
-        student_results = results.get(idx, {})
-        
-        # Calculate SGPA variables
-        total_credits = 0
-        weighted_sum = 0
-        
-        for module_code, grade in student_results.items():
-            if module_code in module_stats and grade in GRADES:
-                credits = module_stats[module_code]["credits"]
-                gpa_value = GRADES[grade]["gpa_4_0"] # Using 4.0 scale for calculation
-                
-                weighted_sum += credits * gpa_value
-                total_credits += credits
-        
-        sgpa = 0.0
-        if total_credits > 0:
-            sgpa = truncate(weighted_sum / total_credits, 3)
-            
-        processed_data[idx] = {
-            "sgpa": truncate(weighted_sum / total_credits, 3) if total_credits > 0 else 0.0,
-            "credits": total_credits,
+    processed_data = {
+        idx: {
+            "sgpa": sgpa,
+            "credits": credits,
             "weighted_points": weighted_sum
         }
-        
+        for idx, sgpa, credits, weighted_sum in zip(
+            student_indices, sgpas.tolist(), total_credits.tolist(), weighted_sums.tolist()
+        )
+    }
+    
+    _SEMESTER_CACHE[cache_key] = (semester_name, processed_data)
     return semester_name, processed_data
 
 def calculate_cgpa_flow(students_db, corrections):
@@ -682,16 +928,19 @@ def calculate_cgpa_flow(students_db, corrections):
 }
     semester_names = []
     
-    # Process each semester
-    for config_file in config_files:
-        sem_name, sem_results = process_semester_for_cgpa(config_file, student_indices, students_db, corrections)
-        semester_names.append(sem_name)
-        
-        for idx, data in sem_results.items():
-            if idx in cgpa_data:
-                cgpa_data[idx]['semesters'][sem_name] = data['sgpa']
-                cgpa_data[idx]['total_credits'] += data['credits']
-                cgpa_data[idx]['total_points'] += data['weighted_points']
+    # Process each semester (one worker pool shared by all of them)
+    with _new_pdf_executor(os.cpu_count() or 1) as executor:
+        for config_file in config_files:
+            sem_name, sem_results = process_semester_for_cgpa(
+                config_file, student_indices, students_db, corrections, executor
+            )
+            semester_names.append(sem_name)
+            
+            for idx, data in sem_results.items():
+                if idx in cgpa_data:
+                    cgpa_data[idx]['semesters'][sem_name] = data['sgpa']
+                    cgpa_data[idx]['total_credits'] += data['credits']
+                    cgpa_data[idx]['total_points'] += data['weighted_points']
                         
     
     # Calculate Final CGPA
@@ -718,34 +967,8 @@ def calculate_cgpa_flow(students_db, corrections):
         # Sort by CGPA descending
         final_results.sort(key=lambda x: x['cgpa'], reverse=True)
     
-    # Assign Ranks
-    print("\n# Exporting CGPA Results...")
-    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-    filename = OUTPUT_FOLDER / "CGPA_Results.xlsx"
-    workbook = xlsxwriter.Workbook(filename)
-    ws = workbook.add_worksheet("CGPA")
-    
-    # Headers
-    headers = ["Rank", "Index", "Name"] + semester_names + ["CGPA"]
-    for i, h in enumerate(headers):
-        ws.write(0, i, h)
-        
-    # Data
-    for rank, student in enumerate(final_results, start=1):
-        row = rank
-        ws.write(row, 0, rank)
-        ws.write(row, 1, student['idx'])
-        ws.write(row, 2, student['name'])
-        
-        col = 3
-        for sem in semester_names:
-            ws.write(row, col, student['semesters'].get(sem, 0.0))
-            col += 1
-            
-        ws.write(row, col, student['cgpa'])
-        
-    workbook.close()
-    print(f"  [OK] Created '{filename}'")
+    # Assign ranks and export
+    export_cgpa_excel(final_results, semester_names)
 
 def calculate_sgpa_flow(students_db, corrections):
     """Execute standard SGPA calculation flow"""
@@ -792,15 +1015,21 @@ def calculate_sgpa_flow(students_db, corrections):
 # ============================================================================
 
 def main():
+    global USE_PDF_CACHE
+    parser = argparse.ArgumentParser(description="University GPA Analysis System")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="re-parse every PDF instead of using .cache/pdf_results")
+    USE_PDF_CACHE = not parser.parse_args().no_cache
+    
     print("=" * 70)
     print("University GPA Analysis System (v5.00)")
     print("=" * 70)
     
     # Load configuration
-    global GRADES
-    GRADES = load_grades(GRADES_FILE)
+    set_grades(load_grades(GRADES_FILE))
     
     corrections = load_corrections(CORRECTIONS_FILE)
+    build_student_details()
     students_db = load_students(STUDENTS_FILE)
     
     if not students_db:
@@ -2,6 +2,8 @@ import sys
 import os
 from pathlib import Path
 import json
+import numpy as np
+import pandas as pd
 
 # Add project root to sys.path
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -15,12 +17,13 @@ from main import (
     GRADES_FILE, STUDENTS_FILE, CORRECTIONS_FILE, SEMESTER_CONFIG_DIR,
     truncate
 )
+from _cache import cached_load, cached_result
 
 def main_cli():
     # 1. Initialize environment
     print("Initializing...")
     # Patch global GRADES in main module so functions in main.py can use it
-    main.GRADES = load_grades(GRADES_FILE) 
+    main.set_grades(cached_load(GRADES_FILE, load_grades))
     
     # 2. Get inputs
     if len(sys.argv) >= 3:
@@ -39,7 +42,7 @@ def main_cli():
         return
 
     # 3. Load Student Data
-    students = load_students(STUDENTS_FILE)
+    students = cached_load(STUDENTS_FILE, load_students)
     if student_idx not in students:
         print(f"Student index {student_idx} not found in student_details.json")
         return
@@ -57,11 +60,11 @@ def main_cli():
             print(f"  - {f.name}")
         return
 
-    semester_config = load_semester_config(sem_config_file)
+    semester_config = cached_load(sem_config_file, load_semester_config)
     sem_name = semester_config.get("semester_name", f"Semester {semester_input}")
 
     # 5. Extract Results
-    corrections = load_corrections(CORRECTIONS_FILE)
+    corrections = cached_load(CORRECTIONS_FILE, load_corrections)
     
     # We filter valid_indices to just this student for safety/speed in validation logic,
     # though PDF extraction still scans rows.
@@ -70,10 +73,19 @@ def main_cli():
     }
     
     print(f"Loading results for {sem_name}...")
-    # Temporarily suppress print statements from main functions if desired, 
-    # but keeping them is fine for feedback.
-    results, available_modules, module_stats = load_all_module_results(
-        semester_config, course_info, corrections
+    # Reuse this student's extracted results while the config, corrections,
+    # grades and the semester's PDFs are unchanged
+    pdf_files = (main.RESULTS_FOLDER / semester_config.get("semester_name", "")).glob("*.pdf")
+    results_deps = (
+        sem_config_file.stat().st_mtime_ns,
+        CORRECTIONS_FILE.stat().st_mtime_ns if CORRECTIONS_FILE.exists() else None,
+        GRADES_FILE.stat().st_mtime_ns,
+        sorted((p.name, p.stat().st_mtime_ns) for p in pdf_files),
+    )
+    results, available_modules, module_stats = cached_result(
+        f"{sem_config_file.stem}-{student_idx}-results",
+        results_deps,
+        lambda: load_all_module_results(semester_config, course_info, corrections)
     )
 
     if student_idx not in results:
@@ -82,54 +94,57 @@ def main_cli():
 
     student_modules = results[student_idx]
     
-    # 6. Calculate & Display
-    print(f"\nResults for {student_name} in {sem_name}:")
-    print("-" * 80)
-    print(f"{'Module':<10} | {'Grade':<5} | {'Credits':<7} | {'GPA Value':<9} | {'Weighted Points':<15}")
-    print("-" * 80)
+    # 6. Calculate & Display (the report is built up and written in one go)
+    rule = "-" * 80
+    lines = [f"\nResults for {student_name} in {sem_name}:", rule]
+    
+    # Grades not in GRADES are ignored completely (no credits added),
+    # mirroring calculate_gpa in main.py
+    modules = sorted(m for m in student_modules if m in module_stats)
+    grades = [student_modules[m] for m in modules]
+    credit_values = [module_stats[m]["credits"] for m in modules]
     
-    total_credits = 0
-    total_weighted = 0
+    # One probe per module into the flat 4.0 table (None = ignored grade)
+    gpa4 = main.GPA_TABLES["4_0"]  # {grade: gpa}, built once by set_grades
+    gpa_lookups = [gpa4.get(g) for g in grades]
     
-    for module in sorted(student_modules.keys()):
-        grade = student_modules[module]
-        if module not in module_stats:
-            continue
-            
-        credits = module_stats[module]["credits"]
-        
-        gpa_val = 0.0
-        if grade in main.GRADES:
-             gpa_val = main.GRADES[grade]["gpa_4_0"]
-        else:
-             # main.py calculate_gpa checks `if grade in GRADES`.
-             # If not in GRADES, it skips contributing to sum and credits.
-             # Wait, main.py lines 324-330:
-             # if module_code in module_stats and grade in GRADES:
-             #    ...
-             # So if not in GRADES, it is IGNORED completely (credits not added).
-             # Let's mimic that behavior.
-             pass
-        
-        # Determine if we should count it
-        if grade in main.GRADES:
-            weighted = credits * gpa_val
-            total_credits += credits
-            total_weighted += weighted
-            print(f"{module:<10} | {grade:<5} | {credits:<7} | {gpa_val:<9} | {weighted:<15.2f}")
-        else:
-            print(f"{module:<10} | {grade:<5} | {credits:<7} | {'N/A':<9} | {'Ignored':<15}")
+    counted = np.array([v is not None for v in gpa_lookups], dtype=bool)
+    credits = np.array(credit_values, dtype=np.float64)
+    gpa_vals = np.array([0.0 if v is None else v for v in gpa_lookups], dtype=np.float64)
+    weighted = credits * gpa_vals
     
-    print("-" * 80)
-    print(f"{'TOTAL':<10} | {'':<5} | {total_credits:<7} | {'':<9} | {total_weighted:<15.2f}")
-    print("-" * 80)
+    total_credits = credits[counted].sum()
+    total_weighted = weighted[counted].sum()
     
-    print(f"\nTotal Weighted Points: {total_weighted:.3f}")
-    print(f"Total Credits:         {total_credits}")
+    # Ignored grades show N/A / Ignored in place of their values
+    table = pd.DataFrame({
+        "Module": modules,
+        "Grade": grades,
+        "Credits": credit_values,
+        "GPA Value": [v if ok else "N/A" for v, ok in zip(gpa_vals.tolist(), counted.tolist())],
+        "Weighted Points": [f"{w:.2f}" if ok else "Ignored"
+                            for w, ok in zip(weighted.tolist(), counted.tolist())],
+    })
+    total_row = pd.DataFrame([{
+        "Module": "TOTAL",
+        "Grade": "",
+        "Credits": f"{total_credits:g}",
+        "GPA Value": "",
+        "Weighted Points": f"{total_weighted:.2f}",
+    }])
+    table = pd.concat([table, total_row], ignore_index=True)
+    lines.append(table.to_string(index=False))
     
     # Use the actual function to calculate/test
-    sgpa_via_func = calculate_gpa(student_modules, module_stats, scale="4_0")
-    print(f"Final SGPA (via calculate_gpa): {sgpa_via_func}")
+    sgpa_via_func = calculate_gpa(student_modules, module_stats, gpa4)
+    
+    lines += [
+        rule,
+        f"\nTotal Weighted Points: {total_weighted:.3f}",
+        f"Total Credits:         {total_credits:g}",
+        f"Final SGPA (via calculate_gpa): {sgpa_via_func}",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     main_cli()
\ No newline at end of file
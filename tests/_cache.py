@@ -0,0 +1,66 @@
+"""
+Small load cache shared by the test scripts
+============================================
+Keeps loader results in RAM and as pickles in .cache/tests, keyed by file mtime
+"""
+
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "tests"
+
+
+def _read_pickle(cache_file, deps):
+    """Return (True, value) if cache_file holds a value stored with equal deps"""
+    if cache_file.exists():
+        with open(cache_file, "rb") as f:
+            cached_deps, value = pickle.load(f)
+        if cached_deps == deps:
+            return True, value
+    return False, None
+
+
+def _write_pickle(cache_file, deps, value):
+    """Store (deps, value) atomically"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    with open(tmp_file, "wb") as f:
+        pickle.dump((deps, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, cache_file)
+
+
+@lru_cache(maxsize=None)
+def _cached_load(path, mtime_ns, loader):
+    cache_file = CACHE_DIR / f"{path.stem}-{loader.__name__}.pkl"
+
+    hit, value = _read_pickle(cache_file, mtime_ns)
+    if not hit:
+        value = loader(path)
+        _write_pickle(cache_file, mtime_ns, value)
+
+    return value
+
+
+def cached_load(path, loader):
+    """Return loader(path), reused while the file's mtime is unchanged"""
+    path = Path(path).resolve()
+    if not path.exists():
+        return loader(path)  # Let the loader handle missing files
+    return _cached_load(path, path.stat().st_mtime_ns, loader)
+
+
+def cached_result(name, deps, compute):
+    """
+    Return compute(), pickled to .cache/tests/<name>.pkl and reused while
+    deps (any picklable value describing the inputs) compares equal
+    """
+    cache_file = CACHE_DIR / f"{name}.pkl"
+
+    hit, value = _read_pickle(cache_file, deps)
+    if not hit:
+        value = compute()
+        _write_pickle(cache_file, deps, value)
+
+    return value
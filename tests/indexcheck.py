@@ -6,7 +6,11 @@ with open("corrections.json","r") as f:
 with open("studentdata.json","r") as f:
     studentdata = json.load(f)
 
-for course in correctiondata:
-    for idx in correctiondata[course]:
-        if idx not in studentdata and len(idx) != 6:
-            print(f"Index {idx} in course {course} not found in student data.")
\ No newline at end of file
+# Flatten once, find the suspect indices with one set difference, then
+# report them with their course
+all_pairs = [(course, idx) for course, entries in correctiondata.items() for idx in entries]
+suspects = {idx for _, idx in all_pairs if len(idx) != 6} - studentdata.keys()
+
+for course, idx in all_pairs:
+    if idx in suspects:
+        print(f"Index {idx} in course {course} not found in student data.")
\ No newline at end of file
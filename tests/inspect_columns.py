@@ -1,4 +1,4 @@
-import tabula
+import pdfplumber
 import pandas as pd
 from pathlib import Path
 
@@ -8,8 +8,13 @@ path = base_dir / file
 
 print(f"Processing {path}...")
 try:
-    # Use stream=True as established
-    tables = tabula.read_pdf(path, pages="all", stream=True, pandas_options={'header': None})
+    # Same table extraction as main.py. Empty cells come back as None or "",
+    # so blank strings are mapped to None for the isna mask below
+    with pdfplumber.open(path) as pdf:
+        tables = [
+            pd.DataFrame(tbl).replace(r"^\s*$", None, regex=True)
+            for page in pdf.pages for tbl in page.extract_tables()
+        ]
     
     print(f"Found {len(tables)} tables.")
     
@@ -21,7 +26,9 @@ try:
         print(df.head())
         
         # Check for non-empty columns
-        df_clean = df.dropna(how='all').dropna(axis=1, how='all')
+        # (one isna pass, then both masks applied in a single indexing op)
+        empty = pd.isna(df.to_numpy())
+        df_clean = df.iloc[~empty.all(axis=1), ~empty.all(axis=0)]
         print(f"Clean Shape: {df_clean.shape}")
         print("Clean snippet:")
         print(df_clean.head())
@@ -1,6 +1,5 @@
 import sys
 import os
-import json
 from pathlib import Path
 
 # Add parent directory to path to import main
@@ -11,41 +10,55 @@ sys.path.append(str(parent_dir))
 # Import necessary functions
 from main import extract_results_from_pdf, load_grades
 import main
+from _cache import cached_load
 
-# Manually load grades
 GRADES_FILE = parent_dir / "config" / "grades.json"
-if GRADES_FILE.exists():
-    main.GRADES = load_grades(GRADES_FILE)
-else:
-    main.GRADES = {"A+":{}, "A":{}, "A-":{}, "B+":{}, "B":{}, "B-":{}, "C+":{}, "C":{}, "C-":{}, "D":{}, "I-we":{}, "F":{}}
-
-# Load actual student DB for valid indices
 STUDENTS_FILE = parent_dir / "data" / "student_details.json"
-with open(STUDENTS_FILE, "r") as f:
-    student_data = json.load(f)
+base_dir = parent_dir / "data" / "results" / "sem2"
 
-valid_indices = set()
-for s in student_data.values():
-    try:
-        valid_indices.add(int(s["idx"]))
-    except:
-        pass
+def main_cli():
+    # Manually load grades
+    if GRADES_FILE.exists():
+        main.set_grades(cached_load(GRADES_FILE, load_grades))
+    else:
+        # Only the grade names matter for extraction
+        main.set_grades({g: {"gpa_4_0": 0.0, "gpa_4_2": 0.0}
+                         for g in ["A+", "A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D", "I-we", "F"]})
 
-print(f"Loaded {len(valid_indices)} valid students from DB.")
+    # Load actual student DB for valid indices
+    student_data = cached_load(STUDENTS_FILE, main._jload)
 
-# Test files
-# Test files
-files = ["EN1020.pdf"]
-base_dir = parent_dir / "data" / "results" / "sem2"
+    valid_indices = {
+        int(s["idx"]) for s in student_data.values()
+        if str(s.get("idx", "")).strip().isdigit()
+    }
+
+    print(f"Loaded {len(valid_indices)} valid students from DB.")
+
+    # Test files: the PDFs named on the command line, or every PDF in the semester folder
+    files = sys.argv[1:] or sorted(p.name for p in base_dir.glob("*.pdf"))
+
+    # Always run the parser: skip the parsed-results cache (the workers get
+    # this setting from the pool initializer)
+    main.USE_PDF_CACHE = False
+    
+    # Extract every file in one shared pool (one task per PDF), report in list order
+    with main._new_pdf_executor(max(1, min(len(files), os.cpu_count() or 1))) as executor:
+        futures = [
+            (f, executor.submit(extract_results_from_pdf, base_dir / f, valid_indices))
+            for f in files
+        ]
+        
+        for f, future in futures:
+            print(f"\nTesting extraction for {f}...")
+            try:
+                results = future.result()
+                print(f"Extracted {len(results)} records.")
+                if len(results) > 0:
+                    for result in results:
+                        print(f"Index:{result[0]} | Grade:{result[1]}")
+            except Exception as e:
+                print(f"Error: {e}")
 
-for f in files:
-    path = base_dir / f
-    print(f"\nTesting extraction for {f}...")
-    try:
-        results = extract_results_from_pdf(path, valid_indices)
-        print(f"Extracted {len(results)} records.")
-        if len(results) > 0:
-            for result in results:
-                print(f"Index:{result[0]} | Grade:{result[1]}")
-    except Exception as e:
-        print(f"Error: {e}")
+if __name__ == "__main__":
+    main_cli()